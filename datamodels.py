@@ -1,13 +1,20 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
-class Symbol(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Symbol:
     name: str
     parent: str | None = None
     type: str  # "function", "class", etc.
 
-class Docstring(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Docstring:
     file: str | None = None
     name: str
     parent: str | None = None
     type: str
-    docstring: str
\ No newline at end of file
+    docstring: str
+
+
+def to_dict(item: Symbol | Docstring) -> dict:
+    """Return the fields of a model as a dict, like `asdict` but without its recursive copy"""
+    return {name: getattr(item, name) for name in item.__slots__}
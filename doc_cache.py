@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import AbstractSet, List, Optional, Union
+from datamodels import Docstring, to_dict
+
+DEFAULT_CACHE_PATH = ".doc_extractor_cache.sqlite"
+# Stored as the database's user_version. Bump it whenever an extractor's output or the payload
+# format changes, so entries written by older code are dropped instead of being served.
+CACHE_VERSION = 2
+# Entries are written in batches of this many, each in one short transaction, so the write lock
+# is only held briefly and other processes sharing the cache are not locked out for a whole run
+COMMIT_EVERY = 256
+
+
+class DocCache:
+    """
+    Persistent SQLite cache of the docstrings extracted from each file.
+
+    An entry is keyed by file path and remembers which extractor produced it and the SHA-256
+    digest of the content it was extracted from, so a changed file (or one now handled by a
+    different extractor) misses the cache and is parsed again. Entries also record the file's
+    modification time and size, so `get_unchanged` can answer for untouched files without
+    them being read at all. A cache written by a different `CACHE_VERSION` is emptied when it
+    is opened. Stored entries are buffered and written every `COMMIT_EVERY` entries, on
+    `commit`, and on `close`; lookups only see entries once they are written.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_CACHE_PATH):
+        self._conn = sqlite3.connect(str(db_path))
+        # Entries from another version may hold output the current extractors no longer
+        # produce, or use an older table layout; start over rather than serve them
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != CACHE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS docstrings")
+            self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION:d}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docstrings ("
+            "path TEXT PRIMARY KEY, "
+            "extractor TEXT NOT NULL, "
+            "sha256 BLOB NOT NULL, "
+            "payload BLOB NOT NULL, "
+            "mtime_ns INTEGER, "
+            "size INTEGER)"
+        )
+        self._unwritten: List[tuple] = []
+
+    def get(self, path: str, extractor: str, digest: bytes) -> Optional[List[Docstring]]:
+        """
+        Looks up the docstrings cached for a file.
+
+        Args:
+            path (str): The file path the entry was stored under.
+            extractor (str): Name of the extractor class that handles the file.
+            digest (bytes): SHA-256 digest of the file's current content.
+
+        Returns:
+            List[Docstring] | None: The cached docstrings, or None on a miss or a stale entry.
+        """
+        row = self._conn.execute(
+            "SELECT payload FROM docstrings WHERE path = ? AND extractor = ? AND sha256 = ?",
+            (path, extractor, digest)
+        ).fetchone()
+        if row is None:
+            return None
+        return [Docstring(**doc) for doc in json.loads(row[0])]
+
+    def get_unchanged(
+        self,
+        path: str,
+        extractor: str,
+        mtime_ns: int,
+        size: int
+    ) -> Optional[List[Docstring]]:
+        """
+        Looks up the docstrings cached for a file whose modification time and size are unchanged.
+
+        Like `make`, this trusts the file system's timestamps, which lets callers skip reading
+        and hashing untouched files. Use `get` to check the content itself.
+
+        Args:
+            path (str): The file path the entry was stored under.
+            extractor (str): Name of the extractor class that handles the file.
+            mtime_ns (int): The file's current modification time, in nanoseconds.
+            size (int): The file's current size in bytes.
+
+        Returns:
+            List[Docstring] | None: The cached docstrings, or None on a miss or a stale entry.
+        """
+        row = self._conn.execute(
+            "SELECT payload FROM docstrings "
+            "WHERE path = ? AND extractor = ? AND mtime_ns = ? AND size = ?",
+            (path, extractor, mtime_ns, size)
+        ).fetchone()
+        if row is None:
+            return None
+        return [Docstring(**doc) for doc in json.loads(row[0])]
+
+    def put(
+        self,
+        path: str,
+        extractor: str,
+        digest: bytes,
+        docstrings: List[Docstring],
+        mtime_ns: Optional[int] = None,
+        size: Optional[int] = None
+    ):
+        """
+        Stores the docstrings extracted from a file, replacing any previous entry for it.
+
+        Args:
+            path (str): The file path to store the entry under.
+            extractor (str): Name of the extractor class that produced the docstrings.
+            digest (bytes): SHA-256 digest of the content the docstrings were extracted from.
+            docstrings (List[Docstring]): The extracted docstrings.
+            mtime_ns (int | None): The file's modification time in nanoseconds, if known.
+            size (int | None): The file's size in bytes, if known.
+        """
+        payload = json.dumps([to_dict(doc) for doc in docstrings]).encode("utf8")
+        self._unwritten.append((path, extractor, digest, payload, mtime_ns, size))
+        if len(self._unwritten) >= COMMIT_EVERY:
+            self.commit()
+
+    def purge_missing(self, root: str, present: AbstractSet[str] = frozenset()):
+        """
+        Deletes the entries of files under a directory that no longer exist.
+
+        Args:
+            root (str): The directory whose entries are checked, as it prefixes their paths.
+            present (AbstractSet[str]): Paths known to exist, which are kept without a check.
+        """
+        prefix = os.path.join(root, "")
+        stale = [
+            (path,)
+            for (path,) in self._conn.execute(
+                "SELECT path FROM docstrings WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+            if path not in present and not os.path.exists(path)
+        ]
+        if stale:
+            self._conn.executemany("DELETE FROM docstrings WHERE path = ?", stale)
+            self.commit()
+
+    def commit(self):
+        """Writes the buffered entries and commits, releasing the database's write lock."""
+        if self._unwritten:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO docstrings (path, extractor, sha256, payload, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._unwritten
+            )
+            self._unwritten = []
+        self._conn.commit()
+
+    def close(self):
+        """Commits pending writes and closes the database."""
+        self.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "DocCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,14 +1,164 @@
+import os
 from abc import ABC, abstractmethod
-from datamodels import Docstring
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, NamedTuple
+from tree_sitter import Parser, Tree
+from datamodels import Docstring, Symbol
+from .parsing import InputEdit, get_shared_parser, parse_incremental, shared_parser_language
+
+# Below this many files, process startup costs more than the parsing it spreads out
+MIN_PARALLEL_BATCH = 16
+# How many files' trees an incremental extractor keeps for reparsing
+INCREMENTAL_TREES_SIZE = 64
+
+
+class _SharedParserRef(NamedTuple):
+    """Stands in for a shared parser in a pickled extractor"""
+    language: str
+
+
+def _extract_one(extractor: "DocstringExtractor", code: str | bytes) -> list[Docstring]:
+    """Extract docstrings inside a worker process"""
+    return extractor.extract_docstrings(code)
+
 
 class DocstringExtractor(ABC):
+    """
+    Base class of the language extractors.
+
+    Extractors are pickled to send them to worker processes. Parsers cannot be pickled, so each
+    parser made by `get_shared_parser` is replaced by its language name and the receiving
+    process looks up its own; other instance state is pickled as usual.
+    """
+
+    def __getstate__(self) -> dict:
+        state = vars(self).copy()
+        for name, value in state.items():
+            if isinstance(value, Parser):
+                language = shared_parser_language(value)
+                if language is None:
+                    raise TypeError(
+                        f"cannot pickle {type(self).__name__}: its parser does not come from "
+                        "get_shared_parser"
+                    )
+                state[name] = _SharedParserRef(language)
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            if isinstance(value, _SharedParserRef):
+                state[name] = get_shared_parser(value.language)
+        vars(self).update(state)
+
     @property
     @abstractmethod
     def suffix(self) -> list[str]:
         """File suffix (e.g., '.py')"""
         pass
-    
+
     @abstractmethod
-    def extract_docstrings(self, code: str) -> list[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> list[Docstring]:
         """Extract docstrings from a single file"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def extract_used_symbols(self, code: str | bytes) -> list[Symbol]:
+        """Extract the symbols a single file uses"""
+        pass
+
+    def iter_docstrings(self, code: str | bytes) -> Iterator[Docstring]:
+        """Yield docstrings from a single file; extractors that can stream override this"""
+        yield from self.extract_docstrings(code)
+
+    def extract_all(self, code: str | bytes) -> tuple[list[Docstring], list[Symbol]]:
+        """
+        Extract both docstrings and used symbols from a single file.
+
+        Extractors that parse through `parse_cached` build the syntax tree once and
+        share it between the two passes.
+        """
+        return self.extract_docstrings(code), self.extract_used_symbols(code)
+
+    def extract_docstrings_batch(
+        self,
+        codes: list[str | bytes],
+        max_workers: int | None = None
+    ) -> list[list[Docstring]]:
+        """
+        Extract docstrings from many files, spreading large batches across processes.
+
+        Each worker receives a copy of this extractor. Results are returned in the same order
+        as `codes`.
+        """
+        if len(codes) < MIN_PARALLEL_BATCH:
+            return [self.extract_docstrings(code) for code in codes]
+
+        max_workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(codes) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_extract_one, repeat(self), codes, chunksize=chunksize))
+
+
+class IncrementalDocstringExtractor(DocstringExtractor):
+    """
+    An extractor that can reparse new revisions of a file instead of parsing them from scratch.
+
+    The tree of each file is kept between calls, up to `max_trees` files; the least recently
+    used tree is dropped beyond that, and its file's next revision is parsed cold. Subclasses
+    provide `parser` and `_iter_docstrings_from_tree`.
+    """
+
+    def __init__(self, max_trees: int = INCREMENTAL_TREES_SIZE):
+        self._trees: "OrderedDict[str, Tree]" = OrderedDict()
+        self._max_trees = max_trees
+
+    @abstractmethod
+    def _iter_docstrings_from_tree(self, tree: Tree, code_bytes: bytes) -> Iterator[Docstring]:
+        """Yield the docstrings of an already parsed file"""
+        pass
+
+    def extract_docstrings_incremental(
+        self,
+        code: str | bytes,
+        path: str,
+        edits: list[InputEdit] | None = None
+    ) -> list[Docstring]:
+        """
+        Extracts docstrings from a new revision of a file processed earlier by this extractor.
+
+        The tree kept from the previous call for `path` is edited and reused, so Tree-sitter
+        only reparses the changed regions. The first call for a path is a cold parse.
+
+        Args:
+            code (str | bytes): The current source code, as text or UTF-8 bytes.
+            path (str): Identifies the file across calls.
+            edits (list[InputEdit] | None): The edits made since the previous call for `path`.
+
+        Returns:
+            list[Docstring]: A list of extracted documentation objects.
+        """
+        # Taken out while it is edited, so it is never left half-edited in the cache
+        old_tree = self._trees.pop(path, None)
+        tree, code_bytes = parse_incremental(self.parser, code, old_tree, edits)
+
+        self._trees[path] = tree
+        if len(self._trees) > self._max_trees:
+            self._trees.popitem(last=False)
+
+        return list(self._iter_docstrings_from_tree(tree, code_bytes))
+
+    def __getstate__(self) -> dict:
+        # Trees cannot be pickled; a copy of the extractor starts without any
+        state = super().__getstate__()
+        state["_trees"] = OrderedDict()
+        return state
+
+    def forget_tree(self, path: str):
+        """Drop the tree kept for `path`, e.g. once the file is closed or deleted"""
+        self._trees.pop(path, None)
+
+    def clear_trees(self):
+        """Drop every kept tree"""
+        self._trees.clear()
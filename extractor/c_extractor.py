@@ -1,17 +1,44 @@
-from tree_sitter_languages import get_parser
-from typing import List, Dict
-from .base import DocstringExtractor
+from tree_sitter import Tree
+from tree_sitter_languages import get_language
+from typing import Dict, Iterator, List
+from .base import INCREMENTAL_TREES_SIZE, IncrementalDocstringExtractor
+from .parsing import get_shared_parser, parse_cached
 from datamodels import Docstring, Symbol
 
+_SKIPPABLE_TYPES = frozenset({";", "}"})
+_NAME_TYPES = frozenset({"identifier", "field_identifier"})
+_STRUCT_NAME_TYPES = frozenset({"type_identifier", "identifier"})
+_SCOPE_TYPES = frozenset({"struct_specifier", "type_definition"})
+_STRUCT_DEFINITION_PARENTS = frozenset({"type_definition", "field_declaration"})
+_TYPEDEF_DEFINITION_PARENTS = frozenset({"type_definition", "typedef_definition", "field_declaration"})
 
-class CDocstringExtractor(DocstringExtractor):
+
+class CDocstringExtractor(IncrementalDocstringExtractor):
     """
     Extracts documentation comments from C source files using Tree-sitter.
     Handles function declarations, struct definitions, typedefs, and fields.
     """
 
-    def __init__(self):
-        self._parser = get_parser("c")
+    # Compiled once for all instances; captures come back in document order
+    _doc_query = get_language("c").query("""
+        (function_definition) @definition
+        (declaration) @definition
+        (field_declaration) @definition
+        (struct_specifier) @definition
+        (type_definition) @definition
+    """)
+
+    _use_query = get_language("c").query("""
+        (call_expression function: (identifier)) @use
+        (struct_specifier) @use
+        (type_identifier) @use
+        (field_expression) @use
+        (call_expression (pointer_expression) @use)
+    """)
+
+    def __init__(self, max_trees: int = INCREMENTAL_TREES_SIZE):
+        super().__init__(max_trees)
+        self._parser = get_shared_parser("c")
 
     @property
     def parser(self):
@@ -21,7 +48,7 @@ class CDocstringExtractor(DocstringExtractor):
     def suffix(self) -> list[str]:
         return [".c", ".h"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts block (`/* ... */`) and grouped `//` comments from C code.
 
@@ -34,45 +61,62 @@ class CDocstringExtractor(DocstringExtractor):
         Returns:
             List[Docstring]: A list of extracted documentation objects.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root_node = tree.root_node
-        docstrings: List[Docstring] = []
+        return list(self.iter_docstrings(code))
+
+    def iter_docstrings(self, code: str | bytes) -> Iterator[Docstring]:
+        """
+        Yields the same docstrings as `extract_docstrings`, one at a time as they are found.
+
+        Args:
+            code (str | bytes): The C source code, as text or UTF-8 bytes.
 
+        Returns:
+            Iterator[Docstring]: The extracted documentation objects, in document order.
+        """
+        tree, code_bytes = parse_cached(self.parser, code)
+        yield from self._iter_docstrings_from_tree(tree, code_bytes)
+
+    def _iter_docstrings_from_tree(self, tree: Tree, code_bytes: bytes) -> Iterator[Docstring]:
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
 
         def extract_leading_doc_comment(node):
-            if not hasattr(node, "parent") or node.parent is None:
-                return None
-
-            siblings = node.parent.children
-            idx = siblings.index(node)
             collected = []
+            prev = node.prev_sibling
 
-            for i in reversed(range(0, idx)):
-                prev = siblings[i]
-                text = get_node_text(prev)
-
+            while prev is not None:
                 if prev.type == "comment":
-                    if text.startswith("/*"):
-                        return text
-                    elif text.startswith("//"):
-                        collected.insert(0, text)
+                    # Classify on the raw bytes and only decode comments that are kept;
+                    # line comments are the common case inside a run, so test them first
+                    raw = code_bytes[prev.start_byte:prev.end_byte]
+                    if raw.startswith(b"//"):
+                        collected.append(raw.decode("utf8").strip())
+                    elif raw.startswith(b"/*"):
+                        return raw.decode("utf8").strip()
                     else:
                         break
-                elif prev.type in [";", "}"]:
-                    continue
-                else:
+                elif prev.type not in _SKIPPABLE_TYPES:
                     break
 
+                prev = prev.prev_sibling
+
             if collected:
-                return "\n".join(collected)
+                return "\n".join(reversed(collected))
 
             return None
 
+        name_cache: Dict[int, str] = {}
+
         def get_node_name(node):
+            """Return the name of `node`, computing it once per node."""
+            name = name_cache.get(node.id)
+            if name is None:
+                name = name_cache[node.id] = find_node_name(node)
+            return name
+
+        def find_node_name(node):
             """Recursively find the most likely symbol name from C declarations."""
-            if node.type in ["identifier", "field_identifier"]:
+            if node.type in _NAME_TYPES:
                 return get_node_text(node)
 
             if node.type == "type_definition":
@@ -82,7 +126,7 @@ class CDocstringExtractor(DocstringExtractor):
 
             if node.type == "struct_specifier":
                 for child in node.children:
-                    if child.type in ["type_identifier", "identifier"]:
+                    if child.type in _STRUCT_NAME_TYPES:
                         return get_node_text(child)
 
             for child in node.children:
@@ -96,110 +140,92 @@ class CDocstringExtractor(DocstringExtractor):
 
             return "<anonymous>"
 
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
-
-            is_parent_scope = node.type in ["struct_specifier", "type_definition", "typedef_definition"]
-
-            if node.type in [
-                "function_definition",
-                "declaration",
-                "field_declaration",
-                "struct_specifier",
-                "type_definition",
-                "typedef_definition",
-            ]:
-                doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
-                if doc:
-                    docstrings.append(Docstring(
-                        name=name,
-                        type=node.type.replace("_", " "),
-                        parent=parent_stack[-1] if parent_stack else None,
-                        docstring=doc
-                    ))
-
-                if is_parent_scope:
-                    parent_stack.append(name)
-
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if is_parent_scope and parent_stack:
-                parent_stack.pop()
-
-        traverse(root_node)
-        return docstrings
+        def get_parent_name(node):
+            """Find the name of the closest enclosing struct or typedef."""
+            parent = node.parent
+            while parent is not None:
+                if parent.type in _SCOPE_TYPES:
+                    return get_node_name(parent)
+                parent = parent.parent
+            return None
 
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+        for node, _ in self._doc_query.captures(tree.root_node):
+            doc = extract_leading_doc_comment(node)
+            if doc:
+                yield Docstring(
+                    name=get_node_name(node),
+                    type=node.type.replace("_", " "),
+                    parent=get_parent_name(node),
+                    docstring=doc
+                )
+
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts usage of symbols that would be documented by extract_docstrings.
         Focuses on functions, structs, typedefs, and their members.
         
         Args:
-            code (str): The C source code
+            code (str | bytes): The C source code, as text or UTF-8 bytes
             
         Returns:
             List[Symbol]: List of used symbols with name, parent, and type
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         used: List[Symbol] = []
 
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
-
-        def walk(node):
-            # Function calls - matches function_definition in docstrings
-            if node.type == "call_expression":
-                fn_node = node.child_by_field_name("function")
-                if fn_node and fn_node.type == "identifier":
-                    name = get_node_text(fn_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type="function"
-                    ))
-            
-            # Struct usage - matches struct_specifier in docstrings
-            elif node.type == "struct_specifier":
-                # Only count when used as type (not definitions)
-                if node.parent and node.parent.type not in ["type_definition", "field_declaration"]:
-                    name = get_node_text(node.child_by_field_name("name"))
-                    if name:
-                        used.append(Symbol(
-                            name=name,
-                            parent=None,
-                            type="struct"
-                        ))
-            
-            # Typedef usage - matches type_definition/typedef_definition in docstrings
-            elif node.type == "type_identifier":
-                # Skip if part of a declaration/definition
-                if node.parent.type not in ["type_definition", "typedef_definition", "field_declaration"]:
-                    name = get_node_text(node)
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
+
+        # Function calls - matches function_definition in docstrings
+        def on_call_expression(node):
+            fn_node = node.child_by_field_name("function")
+            if fn_node and fn_node.type == "identifier":
+                name = get_node_text(fn_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=None,
+                    type="function"
+                ))
+
+        # Struct usage - matches struct_specifier in docstrings
+        def on_struct_specifier(node):
+            # Only count when used as type (not definitions)
+            if node.parent and node.parent.type not in _STRUCT_DEFINITION_PARENTS:
+                name = get_node_text(node.child_by_field_name("name"))
+                if name:
                     used.append(Symbol(
                         name=name,
                         parent=None,
-                        type="typedef"
+                        type="struct"
                     ))
-            
-            # Struct member access - matches field_declaration in docstrings
-            elif node.type == "field_expression":
-                field_node = node.child_by_field_name("field")
-                parent_node = node.child_by_field_name("argument")
-                if field_node and parent_node:
-                    parent = get_node_text(parent_node)
-                    name = get_node_text(field_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=parent,
-                        type="field"
-                    ))
-            
-            # Function pointer calls
-            elif node.type == "pointer_expression" and node.parent.type == "call_expression":
+
+        # Typedef usage - matches type_definition/typedef_definition in docstrings
+        def on_type_identifier(node):
+            # Skip if part of a declaration/definition
+            if node.parent.type not in _TYPEDEF_DEFINITION_PARENTS:
+                name = get_node_text(node)
+                used.append(Symbol(
+                    name=name,
+                    parent=None,
+                    type="typedef"
+                ))
+
+        # Struct member access - matches field_declaration in docstrings
+        def on_field_expression(node):
+            field_node = node.child_by_field_name("field")
+            parent_node = node.child_by_field_name("argument")
+            if field_node and parent_node:
+                parent = get_node_text(parent_node)
+                name = get_node_text(field_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=parent,
+                    type="field"
+                ))
+
+        # Function pointer calls
+        def on_pointer_expression(node):
+            if node.parent.type == "call_expression":
                 ptr_node = node.child_by_field_name("argument")
                 if ptr_node and ptr_node.type == "identifier":
                     name = get_node_text(ptr_node)
@@ -209,9 +235,15 @@ class CDocstringExtractor(DocstringExtractor):
                         type="function_pointer"
                     ))
 
-            # Recurse through children
-            for child in node.children:
-                walk(child)
+        handlers = {
+            "call_expression": on_call_expression,
+            "struct_specifier": on_struct_specifier,
+            "type_identifier": on_type_identifier,
+            "field_expression": on_field_expression,
+            "pointer_expression": on_pointer_expression,
+        }
+
+        for node, _ in self._use_query.captures(tree.root_node):
+            handlers[node.type](node)
 
-        walk(root)
         return used
\ No newline at end of file
@@ -1,17 +1,43 @@
-from tree_sitter_languages import get_parser
-from typing import List, Dict
-from .base import DocstringExtractor
+from tree_sitter import Tree
+from tree_sitter_languages import get_language
+from typing import Dict, Iterator, List
+from .base import INCREMENTAL_TREES_SIZE, IncrementalDocstringExtractor
+from .parsing import get_shared_parser, parse_cached
 from datamodels import Docstring, Symbol
 
+_SKIPPABLE_TYPES = frozenset({";", "}"})
+_NAME_TYPES = frozenset({"identifier", "field_identifier", "type_identifier", "namespace_identifier"})
+_SCOPE_TYPES = frozenset({"class_specifier", "struct_specifier", "namespace_definition"})
+_NAMESPACE_TYPES = frozenset({"namespace_definition", "namespace_alias_definition"})
 
-class CppDocstringExtractor(DocstringExtractor):
+
+class CppDocstringExtractor(IncrementalDocstringExtractor):
     """
     Extracts Doxygen-style documentation comments from C++ source code using Tree-sitter.
     Supports functions, fields, classes, structs, and declarations.
     """
 
-    def __init__(self):
-        self._parser = get_parser("cpp")
+    # Compiled once for all instances; captures come back in document order
+    _doc_query = get_language("cpp").query("""
+        (function_definition) @definition
+        (declaration) @definition
+        (field_declaration) @definition
+        (class_specifier) @definition
+        (struct_specifier) @definition
+        (namespace_definition) @definition
+        (namespace_alias_definition) @definition
+    """)
+
+    _use_query = get_language("cpp").query("""
+        (call_expression function: [(identifier) (qualified_identifier)]) @use
+        (field_expression) @use
+        (new_expression) @use
+        (template_type) @use
+    """)
+
+    def __init__(self, max_trees: int = INCREMENTAL_TREES_SIZE):
+        super().__init__(max_trees)
+        self._parser = get_shared_parser("cpp")
 
     @property
     def parser(self):
@@ -21,7 +47,7 @@ class CppDocstringExtractor(DocstringExtractor):
     def suffix(self) -> list[str]:
         return [".cpp", ".hpp", ".cc", ".hh"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts Doxygen-style (`/** ... */`, `/*! ... */`) or grouped `//`/`///` comments
         from C++ source code.
@@ -35,46 +61,63 @@ class CppDocstringExtractor(DocstringExtractor):
         Returns:
             List[Docstring]: A list of structured docstring objects.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root_node = tree.root_node
-        docstrings: List[Docstring] = []
+        return list(self.iter_docstrings(code))
+
+    def iter_docstrings(self, code: str | bytes) -> Iterator[Docstring]:
+        """
+        Yields the same docstrings as `extract_docstrings`, one at a time as they are found.
 
+        Args:
+            code (str | bytes): The C++ source code, as text or UTF-8 bytes.
+
+        Returns:
+            Iterator[Docstring]: The extracted documentation objects, in document order.
+        """
+        tree, code_bytes = parse_cached(self.parser, code)
+        yield from self._iter_docstrings_from_tree(tree, code_bytes)
+
+    def _iter_docstrings_from_tree(self, tree: Tree, code_bytes: bytes) -> Iterator[Docstring]:
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
 
         def extract_leading_doc_comment(node):
             """Extract /** */, /*! */, ///, or grouped // comments directly above the node."""
-            if not hasattr(node, "parent") or node.parent is None:
-                return None
-
-            siblings = node.parent.children
-            idx = siblings.index(node)
             collected = []
+            prev = node.prev_sibling
 
-            for i in reversed(range(0, idx)):
-                prev = siblings[i]
-                text = get_node_text(prev)
-
+            while prev is not None:
                 if prev.type == "comment":
-                    if text.startswith("/*"):
-                        return text
-                    elif text.startswith("//"):
-                        collected.insert(0, text)
+                    # Classify on the raw bytes and only decode comments that are kept;
+                    # line comments are the common case inside a run, so test them first
+                    raw = code_bytes[prev.start_byte:prev.end_byte]
+                    if raw.startswith(b"//"):
+                        collected.append(raw.decode("utf8").strip())
+                    elif raw.startswith(b"/*"):
+                        return raw.decode("utf8").strip()
                     else:
                         break
-                elif prev.type in [";", "}"]:
-                    continue
-                else:
+                elif prev.type not in _SKIPPABLE_TYPES:
                     break
 
+                prev = prev.prev_sibling
+
             if collected:
-                return "\n".join(collected)
+                return "\n".join(reversed(collected))
 
             return None
 
+        name_cache: Dict[int, str] = {}
+
         def get_node_name(node):
+            """Return the name of `node`, computing it once per node."""
+            name = name_cache.get(node.id)
+            if name is None:
+                name = name_cache[node.id] = find_node_name(node)
+            return name
+
+        def find_node_name(node):
             """Recursively find the first identifier-like name in a node's subtree."""
-            if node.type in ["identifier", "field_identifier", "type_identifier", "namespace_identifier"]:
+            if node.type in _NAME_TYPES:
                 return get_node_text(node)
 
             for child in node.children:
@@ -84,69 +127,27 @@ class CppDocstringExtractor(DocstringExtractor):
 
             return "<anonymous>"
 
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
-
-            is_parent_scope = node.type in ["class_specifier", "struct_specifier", "namespace_definition"]
-            
-            # Handle namespace aliases (they have different structure)
-            if node.type == "namespace_alias":
-                doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
-                if doc:
-                    docstrings.append(Docstring(
-                        name=name,
-                        type="namespace",
-                        parent=parent_stack[-1] if parent_stack else None,
-                        docstring=doc
-                    ))
-            
-            # Handle namespace definitions
-            elif node.type == "namespace_definition":
-                doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
-                if doc:
-                    docstrings.append(Docstring(
-                        name=name,
-                        type="namespace",
-                        parent=parent_stack[-1] if parent_stack else None,
-                        docstring=doc
-                    ))
-                
-                # Add to parent stack before traversing children
-                parent_stack.append(name)
-                
-            if node.type in [
-                "function_definition",
-                "declaration",
-                "field_declaration",
-                "class_specifier",
-                "struct_specifier",
-            ]:
-                doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
-                if doc:
-                    docstrings.append(Docstring(
-                        name=name,
-                        type=node.type.replace("_", " "),
-                        parent=parent_stack[-1] if parent_stack else None,
-                        docstring=doc
-                    ))
-
-                if is_parent_scope:
-                    parent_stack.append(name)
-
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if is_parent_scope and parent_stack:
-                parent_stack.pop()
-
-        traverse(root_node)
-        return docstrings
+        def get_parent_name(node):
+            """Find the name of the closest enclosing class, struct, or namespace."""
+            parent = node.parent
+            while parent is not None:
+                if parent.type in _SCOPE_TYPES:
+                    return get_node_name(parent)
+                parent = parent.parent
+            return None
 
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+        for node, _ in self._doc_query.captures(tree.root_node):
+            doc = extract_leading_doc_comment(node)
+            if doc:
+                is_namespace = node.type in _NAMESPACE_TYPES
+                yield Docstring(
+                    name=get_node_name(node),
+                    type="namespace" if is_namespace else node.type.replace("_", " "),
+                    parent=get_parent_name(node),
+                    docstring=doc
+                )
+
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts used symbols (functions, methods, classes, namespaces) from C++ code.
         
@@ -158,106 +159,95 @@ class CppDocstringExtractor(DocstringExtractor):
         - Namespace usage
         
         Args:
-            code (str): The C++ source code
+            code (str | bytes): The C++ source code, as text or UTF-8 bytes
             
         Returns:
             List[Symbol]: List of used symbols with name, parent, and type
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         used: List[Symbol] = []
 
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
-
-        def walk(node):
-            # Function calls: foo(), std::cout()
-            if node.type == "call_expression":
-                fn_node = node.child_by_field_name("function")
-                
-                if fn_node is None:
-                    return
-                    
-                # Handle namespace/class qualified calls (std::string, Foo::bar)
-                if fn_node.type == "qualified_identifier":
-                    parts = []
-                    current = fn_node
-                    while current.type == "qualified_identifier":
-                        parts.insert(0, get_node_text(current.child_by_field_name("name")))
-                        current = current.child_by_field_name("scope")
-                    
-                    if len(parts) > 1:
-                        used.append(Symbol(
-                            name=parts[-1],
-                            parent="::".join(parts[:-1]),
-                            type="function" if parts[-1][0].islower() else "method"
-                        ))
-                    else:
-                        used.append(Symbol(
-                            name=parts[0],
-                            parent=None,
-                            type="function"
-                        ))
-                
-                # Regular function calls
-                elif fn_node.type == "identifier":
-                    name = get_node_text(fn_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type="function"
-                    ))
-            
-            # Method calls: obj.method(), ptr->method()
-            elif node.type == "field_expression":
-                object_node = node.child_by_field_name("argument")
-                field_node = node.child_by_field_name("field")
-                
-                if object_node and field_node:
-                    parent = get_node_text(object_node)
-                    name = get_node_text(field_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=parent,
-                        type="function"
-                    ))
-            
-            # Constructor calls: Foo(), new Foo()
-            elif node.type in ["new_expression", "constructor_init"]:
-                type_node = node.child_by_field_name("type")
-                if type_node:
-                    name = get_node_text(type_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type="class"
-                    ))
-            
-            # Template instantiations: std::vector<int>
-            elif node.type == "template_type":
-                type_node = node.child_by_field_name("name")
-                if type_node:
-                    name = get_node_text(type_node)
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
+
+        # Function calls: foo(), std::cout()
+        def on_call_expression(node):
+            fn_node = node.child_by_field_name("function")
+
+            # Handle namespace/class qualified calls (std::string, Foo::bar)
+            if fn_node.type == "qualified_identifier":
+                parts = []
+                current = fn_node
+                while current.type == "qualified_identifier":
+                    parts.insert(0, get_node_text(current.child_by_field_name("name")))
+                    current = current.child_by_field_name("scope")
+
+                if len(parts) > 1:
                     used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type="template"
+                        name=parts[-1],
+                        parent="::".join(parts[:-1]),
+                        type="function" if parts[-1][0].islower() else "method"
                     ))
-            
-            # Using declarations: using namespace std;
-            elif node.type == "using_declaration":
-                name_node = node.child_by_field_name("name")
-                if name_node:
-                    name = get_node_text(name_node)
+                else:
                     used.append(Symbol(
-                        name=name,
+                        name=parts[0],
                         parent=None,
-                        type="namespace"
+                        type="function"
                     ))
-            
-            # Recurse through children
-            for child in node.children:
-                walk(child)
 
-        walk(root)
+            # Regular function calls
+            elif fn_node.type == "identifier":
+                name = get_node_text(fn_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=None,
+                    type="function"
+                ))
+
+        # Method calls: obj.method(), ptr->method()
+        def on_field_expression(node):
+            object_node = node.child_by_field_name("argument")
+            field_node = node.child_by_field_name("field")
+
+            if object_node and field_node:
+                parent = get_node_text(object_node)
+                name = get_node_text(field_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=parent,
+                    type="function"
+                ))
+
+        # Constructor calls: Foo(), new Foo()
+        def on_constructor_call(node):
+            type_node = node.child_by_field_name("type")
+            if type_node:
+                name = get_node_text(type_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=None,
+                    type="class"
+                ))
+
+        # Template instantiations: std::vector<int>
+        def on_template_type(node):
+            type_node = node.child_by_field_name("name")
+            if type_node:
+                name = get_node_text(type_node)
+                used.append(Symbol(
+                    name=name,
+                    parent=None,
+                    type="template"
+                ))
+
+        handlers = {
+            "call_expression": on_call_expression,
+            "field_expression": on_field_expression,
+            "new_expression": on_constructor_call,
+            "template_type": on_template_type,
+        }
+
+        for node, _ in self._use_query.captures(tree.root_node):
+            handlers[node.type](node)
+
         return used
\ No newline at end of file
@@ -1,8 +1,26 @@
-from tree_sitter_languages import get_parser
+import sys
+from tree_sitter_languages import get_language
 from typing import List, Dict
 from .base import DocstringExtractor
+from .parsing import get_shared_parser, node_text_getter, parse_cached
 from datamodels import Docstring, Symbol
 
+_SKIPPABLE_TYPES = frozenset({";", "modifiers"})
+_SCOPE_TYPES = frozenset({"class_declaration", "interface_declaration"})
+_TYPE_DEFINITION_PARENTS = frozenset({
+    "class_declaration",
+    "interface_declaration",
+    "method_declaration",
+    "constructor_declaration"
+})
+_TYPE_LABELS = {
+    "class_declaration": "class declaration",
+    "interface_declaration": "interface declaration",
+    "method_declaration": "method declaration",
+    "constructor_declaration": "constructor declaration",
+    "field_declaration": "field declaration",
+}
+
 
 class JavaDocstringExtractor(DocstringExtractor):
     """
@@ -10,8 +28,24 @@ class JavaDocstringExtractor(DocstringExtractor):
     Supports class, interface, method, constructor, and field documentation.
     """
 
+    # Compiled once for all instances; captures come back in document order
+    _doc_query = get_language("java").query("""
+        (class_declaration) @definition
+        (interface_declaration) @definition
+        (method_declaration) @definition
+        (constructor_declaration) @definition
+        (field_declaration) @definition
+    """)
+
+    _use_query = get_language("java").query("""
+        (method_invocation) @use
+        (object_creation_expression) @use
+        (field_access) @use
+        (type_identifier) @use
+    """)
+
     def __init__(self):
-        self._parser = get_parser("java")
+        self._parser = get_shared_parser("java")
 
     @property
     def parser(self):
@@ -21,7 +55,7 @@ class JavaDocstringExtractor(DocstringExtractor):
     def suffix(self) -> list[str]:
         return [".java"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts Javadoc (`/** ... */`) and grouped line comments (`//`) from Java code.
 
@@ -29,183 +63,156 @@ class JavaDocstringExtractor(DocstringExtractor):
         preceding class, interface, method, field, and constructor declarations.
 
         Args:
-            code (str): The Java source code as a string.
+            code (str | bytes): The Java source code, as text or UTF-8 bytes.
 
         Returns:
             List[Docstring]: A list of extracted docstrings in structured form.
         """
-        tree = self.parser.parse(code.encode("utf8"))
+        tree, code_bytes = parse_cached(self.parser, code)
         root_node = tree.root_node
         docstrings: List[Docstring] = []
 
-        def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+        get_node_text = node_text_getter(code, code_bytes)
 
         def extract_leading_doc_comment(node):
-            if not hasattr(node, "parent") or node.parent is None:
-                return None
-
-            siblings = node.parent.children
-            idx = siblings.index(node)
             collected = []
+            prev = node.prev_sibling
 
-            for i in reversed(range(0, idx)):
-                prev = siblings[i]
-                text = get_node_text(prev)
-
+            while prev is not None:
+                # Classify on the raw bytes and only decode comments that are kept
                 if prev.type == "block_comment":
-                    if text.startswith("/**"):
-                        return text  # Javadoc block
-                    elif text.startswith("/*"):
+                    raw = code_bytes[prev.start_byte:prev.end_byte]
+                    if raw.startswith(b"/**"):
+                        return raw.decode("utf8").strip()  # Javadoc block
+                    elif raw.startswith(b"/*"):
                         break  # Non-doc block comment — skip
                 elif prev.type == "line_comment":
-                    if text.startswith("//"):
-                        collected.insert(0, text)
+                    raw = code_bytes[prev.start_byte:prev.end_byte]
+                    if raw.startswith(b"//"):
+                        collected.append(raw.decode("utf8").strip())
                     else:
                         break
-                elif prev.type in [";", "modifiers"]:
-                    continue
-                else:
+                elif prev.type not in _SKIPPABLE_TYPES:
                     break
 
+                prev = prev.prev_sibling
+
             if collected:
-                return "\n".join(collected)
+                return "\n".join(reversed(collected))
 
             return None
 
         def get_node_name(node):
-            if node.type == "identifier":
-                return get_node_text(node)
-
-            for child in node.children:
-                name = get_node_name(child)
-                if name != "<anonymous>":
-                    return name
-
-            return "<anonymous>"
-
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
-
-            is_scope = node.type in ["class_declaration", "interface_declaration"]
-
-            if node.type in [
-                "class_declaration",
-                "interface_declaration",
-                "method_declaration",
-                "constructor_declaration",
-                "field_declaration"
-            ]:
-                doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
-                if doc:
-                    docstrings.append(Docstring(
-                        name=name,
-                        type=node.type.replace("_", " "),
-                        parent=parent_stack[-1] if parent_stack else None,
-                        docstring=doc
-                    ))
-                if is_scope:
-                    parent_stack.append(name)
-
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if is_scope and parent_stack:
-                parent_stack.pop()
-
-        traverse(root_node)
+            """Read the declared name from the grammar's `name` field."""
+            name_node = node.child_by_field_name("name")
+
+            # Fields name their variables, not themselves: `int a, b;`
+            if name_node is None and node.type == "field_declaration":
+                declarator = node.child_by_field_name("declarator")
+                if declarator:
+                    name_node = declarator.child_by_field_name("name")
+
+            return get_node_text(name_node) if name_node else "<anonymous>"
+
+        def get_parent_name(node):
+            """Find the name of the closest enclosing class or interface."""
+            parent = node.parent
+            while parent is not None:
+                if parent.type in _SCOPE_TYPES:
+                    # Every member of a class repeats its name; keep a single copy
+                    return sys.intern(get_node_name(parent))
+                parent = parent.parent
+            return None
+
+        for node, _ in self._doc_query.captures(root_node):
+            doc = extract_leading_doc_comment(node)
+            if doc:
+                docstrings.append(Docstring(
+                    name=get_node_name(node),
+                    type=_TYPE_LABELS[node.type],
+                    parent=get_parent_name(node),
+                    docstring=doc
+                ))
+
         return docstrings
 
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts usage of symbols that would be documented by extract_docstrings.
         Focuses on classes, interfaces, methods, constructors, and fields.
         
         Args:
-            code (str): The Java source code
+            code (str | bytes): The Java source code, as text or UTF-8 bytes
             
         Returns:
             List[Symbol]: List of used symbols with name, parent, and type
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         used: List[Symbol] = []
+        append = used.append
+
+        get_node_text = node_text_getter(code, code_bytes)
+
+        # Method calls: obj.method(), Class.staticMethod()
+        def on_method_invocation(node):
+            method_node = node.child_by_field_name("name")
+            if not method_node:
+                return
+
+            # Handle instance methods: obj.method()
+            object_node = node.child_by_field_name("object")
+            if object_node:
+                append(Symbol(
+                    name=get_node_text(method_node),
+                    parent=get_node_text(object_node),
+                    type="method"
+                ))
+            # Handle static methods: Class.method()
+            else:
+                append(Symbol(
+                    name=get_node_text(method_node),
+                    parent=None,
+                    type="method"
+                ))
 
-        def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
-
-        def walk(node, current_class=None):
-            # Method calls: obj.method(), Class.staticMethod()
-            if node.type == "method_invocation":
-                # Handle instance methods: obj.method()
-                if node.child_by_field_name("object"):
-                    object_node = node.child_by_field_name("object")
-                    method_node = node.child_by_field_name("name")
-                    if object_node and method_node:
-                        parent = get_node_text(object_node)
-                        name = get_node_text(method_node)
-                        used.append(Symbol(
-                            name=name,
-                            parent=parent,
-                            type="method"
-                        ))
-                # Handle static methods: Class.method()
-                else:
-                    method_node = node.child_by_field_name("name")
-                    if method_node:
-                        used.append(Symbol(
-                            name=get_node_text(method_node),
-                            parent=None,
-                            type="method"
-                        ))
-            
-            # Constructor calls: new Class()
-            elif node.type == "object_creation_expression":
-                type_node = node.child_by_field_name("type")
-                if type_node:
-                    used.append(Symbol(
-                        name=get_node_text(type_node),
-                        parent=None,
-                        type="constructor"
-                    ))
-            
-            # Field access: obj.field, Class.staticField
-            elif node.type == "field_access":
-                object_node = node.child_by_field_name("object")
-                field_node = node.child_by_field_name("field")
-                if object_node and field_node:
-                    parent = get_node_text(object_node)
-                    name = get_node_text(field_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=parent,
-                        type="field"
-                    ))
-            
-            # Class references (as types): Class var
-            elif node.type == "type_identifier" and node.parent.type not in [
-                "class_declaration", 
-                "interface_declaration",
-                "method_declaration",
-                "constructor_declaration"
-            ]:
-                used.append(Symbol(
+        # Constructor calls: new Class()
+        def on_object_creation_expression(node):
+            type_node = node.child_by_field_name("type")
+            if type_node:
+                append(Symbol(
+                    name=get_node_text(type_node),
+                    parent=None,
+                    type="constructor"
+                ))
+
+        # Field access: obj.field, Class.staticField
+        def on_field_access(node):
+            object_node = node.child_by_field_name("object")
+            field_node = node.child_by_field_name("field")
+            if object_node and field_node:
+                append(Symbol(
+                    name=get_node_text(field_node),
+                    parent=get_node_text(object_node),
+                    type="field"
+                ))
+
+        # Class references (as types): Class var
+        def on_type_identifier(node):
+            if node.parent.type not in _TYPE_DEFINITION_PARENTS:
+                append(Symbol(
                     name=get_node_text(node),
                     parent=None,
                     type="class"
                 ))
-            
-            # Track current class context for inner class references
-            if node.type == "class_declaration":
-                class_name_node = node.child_by_field_name("name")
-                if class_name_node:
-                    current_class = get_node_text(class_name_node)
-            
-            # Recurse through children
-            for child in node.children:
-                walk(child, current_class)
 
-        walk(root)
+        handlers = {
+            "method_invocation": on_method_invocation,
+            "object_creation_expression": on_object_creation_expression,
+            "field_access": on_field_access,
+            "type_identifier": on_type_identifier,
+        }
+
+        for node, _ in self._use_query.captures(tree.root_node):
+            handlers[node.type](node)
+
         return used
\ No newline at end of file
@@ -1,16 +1,43 @@
-from tree_sitter_languages import get_parser
+import sys
+from tree_sitter_languages import get_language
 from typing import List, Dict
 from .base import DocstringExtractor
+from .parsing import get_shared_parser, node_text_getter, parse_cached
 from datamodels import Docstring, Symbol
 
+_SKIPPABLE_TYPES = frozenset({";", "}"})
+_WRAPPER_TYPES = frozenset({"export_statement", "lexical_declaration"})
+_NAME_TYPES = frozenset({"identifier", "type_identifier", "property_identifier"})
+_FUNCTION_VALUE_TYPES = frozenset({"arrow_function", "function"})
+_TYPE_LABELS = {
+    "function_declaration": "function declaration",
+    "method_definition": "method definition",
+    "class_declaration": "class declaration",
+}
+
 
 class JavaScriptDocstringExtractor(DocstringExtractor):
     """
     Extracts documentation comments from JavaScript source code using Tree-sitter.
     """
 
+    # Compiled once for all instances; captures come back in document order, so an
+    # export statement is always seen before the declarations that follow it
+    _doc_query = get_language("javascript").query("""
+        (function_declaration) @definition
+        (method_definition) @definition
+        (class_declaration) @definition
+        (variable_declaration) @definition
+        (export_statement) @definition
+    """)
+
+    _use_query = get_language("javascript").query("""
+        (call_expression function: [(member_expression) (identifier)]) @use
+        (new_expression constructor: (identifier)) @use
+    """)
+
     def __init__(self):
-        self._parser = get_parser("javascript")
+        self._parser = get_shared_parser("javascript")
 
     @property
     def parser(self):
@@ -20,7 +47,7 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
     def suffix(self) -> list[str]:
         return [".js", ".jsx"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts JSDoc-style (`/** ... */`) and grouped `//` comments from JavaScript code.
 
@@ -34,46 +61,41 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
         Returns:
             List[Docstring]: A list of structured docstring records.
         """
-        tree = self.parser.parse(code.encode("utf8"))
+        tree, code_bytes = parse_cached(self.parser, code)
         root_node = tree.root_node
         docstrings: List[Docstring] = []
         exported_identifiers = set()
 
-        def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+        get_node_text = node_text_getter(code, code_bytes)
 
         def extract_leading_doc_comment(node):
             def find_leading_comment_among_siblings(target_node):
-                if not hasattr(target_node, "parent") or target_node.parent is None:
-                    return None
-
-                siblings = target_node.parent.children
-                idx = siblings.index(target_node)
                 collected = []
+                prev = target_node.prev_sibling
 
-                for i in reversed(range(0, idx)):
-                    prev = siblings[i]
-                    text = get_node_text(prev)
+                while prev is not None:
                     if prev.type == "comment":
-                        if text.startswith("/**"):
-                            return text
-                        elif text.startswith("//"):
-                            collected.insert(0, text)
+                        # Classify on the raw bytes and only decode comments that are kept
+                        raw = code_bytes[prev.start_byte:prev.end_byte]
+                        if raw.startswith(b"/**"):
+                            return raw.decode("utf8").strip()
+                        elif raw.startswith(b"//"):
+                            collected.append(raw.decode("utf8").strip())
                         else:
                             break
-                    elif prev.type in [";", "}"]:
-                        continue
-                    else:
+                    elif prev.type not in _SKIPPABLE_TYPES:
                         break
 
-                return "\n".join(collected) if collected else None
+                    prev = prev.prev_sibling
+
+                return "\n".join(reversed(collected)) if collected else None
 
             comment = find_leading_comment_among_siblings(node)
             if comment:
                 return comment
 
             parent = node.parent
-            while parent is not None and parent.type in ["export_statement", "lexical_declaration"]:
+            while parent is not None and parent.type in _WRAPPER_TYPES:
                 comment = find_leading_comment_among_siblings(parent)
                 if comment:
                     return comment
@@ -82,7 +104,7 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
             return None
 
         def get_node_name(node):
-            if node.type in ["identifier", "type_identifier", "property_identifier"]:
+            if node.type in _NAME_TYPES:
                 return get_node_text(node)
             for child in node.children:
                 name = get_node_name(child)
@@ -98,16 +120,20 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
                             if ident.type == "identifier":
                                 exported_identifiers.add(get_node_text(ident))
 
-        def extract_variable_function_doc(node, parent_stack):
+        def extract_variable_function_doc(node, parent):
             results = []
             for declarator in node.children:
                 if declarator.type != "variable_declarator":
                     continue
 
-                identifier_node = next((c for c in declarator.children if c.type == "identifier"), None)
-                value_node = next((c for c in declarator.children if c.type in ["arrow_function", "function"]), None)
+                identifier_node = declarator.child_by_field_name("name")
+                value_node = declarator.child_by_field_name("value")
 
-                if identifier_node and value_node:
+                # Destructuring patterns have no single name to document
+                if (
+                    identifier_node and identifier_node.type == "identifier"
+                    and value_node and value_node.type in _FUNCTION_VALUE_TYPES
+                ):
                     identifier_name = get_node_text(identifier_node)
                     if identifier_name not in exported_identifiers:
                         continue
@@ -117,50 +143,42 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
                         results.append(Docstring(
                             name=identifier_name,
                             type="arrow function" if value_node.type == "arrow_function" else "function expression",
-                            parent=parent_stack[-1] if parent_stack else None,
+                            parent=parent,
                             docstring=doc
                         ))
             return results
 
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
+        def get_parent_name(node):
+            """Find the name of the closest enclosing class."""
+            parent = node.parent
+            while parent is not None:
+                if parent.type == "class_declaration":
+                    # Every member of a class repeats its name; keep a single copy
+                    return sys.intern(get_node_name(parent))
+                parent = parent.parent
+            return None
+
+        for node, _ in self._doc_query.captures(root_node):
+            if node.type == "export_statement":
+                collect_exported_identifiers(node)
 
-            is_scope = node.type == "class_declaration"
+            elif node.type == "variable_declaration":
+                docstrings.extend(extract_variable_function_doc(node, get_parent_name(node)))
 
-            if node.type in ["function_declaration", "method_definition", "class_declaration"]:
+            else:
                 doc = extract_leading_doc_comment(node)
-                name = get_node_name(node)
                 if doc:
                     docstrings.append(Docstring(
-                        name=name,
-                        type=node.type.replace("_", " "),
-                        parent=parent_stack[-1] if parent_stack else None,
+                        name=get_node_name(node),
+                        type=_TYPE_LABELS[node.type],
+                        parent=get_parent_name(node),
                         docstring=doc
                     ))
-                if is_scope:
-                    parent_stack.append(name)
-
-            elif node.type == "variable_declaration":
-                docstrings.extend(extract_variable_function_doc(node, parent_stack))
-
-            elif node.type == "export_statement":
-                collect_exported_identifiers(node)
-                for child in node.children:
-                    traverse(child, parent_stack)
-                return
-
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if is_scope and parent_stack:
-                parent_stack.pop()
 
-        traverse(root_node)
         return docstrings
 
 
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts used symbols (functions, methods, classes) from a TypeScript code snippet.
 
@@ -168,62 +186,56 @@ class JavaScriptDocstringExtractor(DocstringExtractor):
         constructor calls, and method invocations, and returns them as `Symbol` objects.
 
         Args:
-            code (str): The TypeScript source code.
+            code (str | bytes): The TypeScript source code, as text or UTF-8 bytes.
 
         Returns:
             List[Symbol]: A list of used symbols with name, parent, and type.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         used: List[Symbol] = []
+        append = used.append
 
-        def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+        get_node_text = node_text_getter(code, code_bytes)
 
-        def walk(node):
-            # function or method call: foo(), obj.method()
-            if node.type == "call_expression":
-                fn_node = node.child_by_field_name("function")
+        # function or method call: foo(), obj.method()
+        def on_call_expression(node):
+            fn_node = node.child_by_field_name("function")
 
-                if fn_node is None:
-                    return
+            if fn_node.type == "member_expression":
+                object_node = fn_node.child_by_field_name("object")
+                property_node = fn_node.child_by_field_name("property")
 
-                if fn_node.type == "member_expression":
-                    object_node = fn_node.child_by_field_name("object")
-                    property_node = fn_node.child_by_field_name("property")
-
-                    if object_node and property_node:
-                        parent = get_node_text(object_node)
-                        name = get_node_text(property_node)
-                        used.append(Symbol(
-                            name=name,
-                            parent=parent,
-                            type="method"
-                        ))
-
-                elif fn_node.type == "identifier":
-                    name = get_node_text(fn_node)
-                    # Simple heuristic: Capitalized = class constructor
-                    symbol_type = "class" if name and name[0].isupper() else "function"
-                    used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type=symbol_type
+                if object_node and property_node:
+                    append(Symbol(
+                        name=get_node_text(property_node),
+                        parent=get_node_text(object_node),
+                        type="method"
                     ))
 
-            # constructor usage: new Foo()
-            elif node.type == "new_expression":
-                constructor_node = node.child_by_field_name("constructor")
-                if constructor_node and constructor_node.type == "identifier":
-                    name = get_node_text(constructor_node)
-                    used.append(Symbol(
-                        name=name,
-                        parent=None,
-                        type="class"
-                    ))
-
-            for child in node.children:
-                walk(child)
+            else:
+                name = get_node_text(fn_node)
+                # Simple heuristic: Capitalized = class constructor
+                symbol_type = "class" if name and name[0].isupper() else "function"
+                append(Symbol(
+                    name=name,
+                    parent=None,
+                    type=symbol_type
+                ))
+
+        # constructor usage: new Foo()
+        def on_new_expression(node):
+            append(Symbol(
+                name=get_node_text(node.child_by_field_name("constructor")),
+                parent=None,
+                type="class"
+            ))
+
+        handlers = {
+            "call_expression": on_call_expression,
+            "new_expression": on_new_expression,
+        }
+
+        for node, _ in self._use_query.captures(tree.root_node):
+            handlers[node.type](node)
 
-        walk(root)
         return used
\ No newline at end of file
@@ -0,0 +1,185 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+from tree_sitter import Node, Parser, Tree
+from tree_sitter_languages import get_language, get_parser
+
+PARSE_CACHE_SIZE = 256
+# Total source size the parse cache may hold; trees grow with their source, so this bounds
+# the cache's memory where the entry count alone does not
+PARSE_CACHE_BYTES = 8 * 1024 * 1024
+
+_shared_parsers: dict[str, Parser] = {}
+_shared_parsers_lock = threading.Lock()
+
+_parse_cache: "OrderedDict[tuple[Parser, bytes], tuple[Tree, bytes]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+_parse_cache_bytes = 0
+
+
+def get_shared_parser(language: str) -> Parser:
+    """
+    Returns the process-wide parser for a language, creating it on first use.
+
+    Loading a grammar and building a parser is not free, so extractors share one parser
+    per language instead of creating their own. Sharing also lets `parse_cached` hit across
+    extractor instances.
+
+    Args:
+        language (str): A language name understood by `tree_sitter_languages`.
+
+    Returns:
+        Parser: The shared parser for `language`.
+    """
+    parser = _shared_parsers.get(language)
+    if parser is None:
+        with _shared_parsers_lock:
+            parser = _shared_parsers.get(language)
+            if parser is None:
+                parser = _shared_parsers[language] = get_parser(language)
+    return parser
+
+
+def shared_parser_language(parser: Parser) -> str | None:
+    """Returns the language of a parser made by `get_shared_parser`, or None for any other parser"""
+    for language, shared in list(_shared_parsers.items()):
+        if shared is parser:
+            return language
+    return None
+
+
+def parse_cached(parser: Parser, code: str | bytes) -> tuple[Tree, bytes]:
+    """
+    Parses source code, reusing the previous result when the same content was parsed before.
+
+    Results are kept in a module-level LRU cache keyed by the parser and the SHA-256 digest
+    of the UTF-8 encoded source, so extracting both docstrings and used symbols from the same
+    file only parses it once. The cache holds at most `PARSE_CACHE_SIZE` entries and
+    `PARSE_CACHE_BYTES` of source, evicting the least recently used entries beyond either; a
+    source larger than the byte limit is parsed without being cached. Cached trees are shared
+    and must not be edited in place.
+
+    Args:
+        parser (Parser): The Tree-sitter parser for the source language.
+        code (str | bytes): The source code to parse, as text or UTF-8 bytes.
+
+    Returns:
+        tuple[Tree, bytes]: The syntax tree and the encoded source it was parsed from.
+    """
+    encoded = code if isinstance(code, bytes) else code.encode("utf8")
+    key = (parser, hashlib.sha256(encoded).digest())
+
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return cached
+
+    tree = parser.parse(encoded)
+    if len(encoded) > PARSE_CACHE_BYTES:
+        return tree, encoded
+
+    global _parse_cache_bytes
+    with _parse_cache_lock:
+        if key not in _parse_cache:
+            _parse_cache[key] = (tree, encoded)
+            _parse_cache_bytes += len(encoded)
+            while len(_parse_cache) > PARSE_CACHE_SIZE or _parse_cache_bytes > PARSE_CACHE_BYTES:
+                _, (_, evicted) = _parse_cache.popitem(last=False)
+                _parse_cache_bytes -= len(evicted)
+
+    return tree, encoded
+
+
+def node_text_getter(code: str | bytes, code_bytes: bytes) -> Callable[[Node], str]:
+    """
+    Returns a function that reads the stripped source text of a node.
+
+    Tree-sitter reports byte offsets. When the source is pure ASCII these are also `str`
+    offsets, so the returned function slices `code` directly and skips decoding; otherwise
+    (or when the source was given as bytes) it slices `code_bytes` and decodes the result.
+
+    Args:
+        code (str | bytes): The source code, as text or UTF-8 bytes.
+        code_bytes (bytes): The UTF-8 encoded source the tree was parsed from.
+
+    Returns:
+        Callable[[Node], str]: Maps a node to its stripped source text.
+    """
+    if isinstance(code, str) and code.isascii():
+        def get_node_text(node):
+            return code[node.start_byte:node.end_byte].strip()
+    else:
+        def get_node_text(node):
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
+
+    return get_node_text
+
+
+def kind_ids(language: str, *kinds: str, named: bool = True) -> frozenset[int]:
+    """
+    Returns the integer ids of node kinds, for comparing against `Node.kind_id`.
+
+    Testing an int against a frozenset is cheaper than comparing `Node.type` strings on every
+    visited node. A kind name can map to several ids, so all matching ids are collected. The ids
+    are read with `node_kind_for_id` because `Language.id_for_node_kind` crashes in the
+    bundled bindings.
+
+    Args:
+        language (str): A language name understood by `tree_sitter_languages`.
+        *kinds (str): Node kind names, e.g. "function_definition".
+        named (bool): Whether to look up named kinds, or anonymous tokens such as ";".
+
+    Returns:
+        frozenset[int]: Every kind id of the requested namedness whose name is in `kinds`.
+    """
+    lang = get_language(language)
+    wanted = set(kinds)
+    return frozenset(
+        kind_id
+        for kind_id in range(lang.node_kind_count)
+        if lang.node_kind_is_named(kind_id) == named and lang.node_kind_for_id(kind_id) in wanted
+    )
+
+
+class InputEdit(NamedTuple):
+    """A single source edit, in the form expected by `Tree.edit`."""
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: tuple[int, int]
+    old_end_point: tuple[int, int]
+    new_end_point: tuple[int, int]
+
+
+def parse_incremental(
+    parser: Parser,
+    code: str | bytes,
+    old_tree: Tree | None = None,
+    edits: list[InputEdit] | None = None
+) -> tuple[Tree, bytes]:
+    """
+    Reparses edited source code, reusing the unchanged subtrees of a previous tree.
+
+    The edits are applied to `old_tree` in place before it is handed to the parser, so
+    the old tree must be owned by the caller (never one returned by `parse_cached`).
+    Without an old tree or edits this is a cold parse.
+
+    Args:
+        parser (Parser): The Tree-sitter parser for the source language.
+        code (str | bytes): The edited source code, as text or UTF-8 bytes.
+        old_tree (Tree | None): The tree of the source before the edits.
+        edits (list[InputEdit] | None): The edits made since `old_tree` was parsed.
+
+    Returns:
+        tuple[Tree, bytes]: The syntax tree and the encoded source it was parsed from.
+    """
+    encoded = code if isinstance(code, bytes) else code.encode("utf8")
+    if old_tree is None or not edits:
+        return parser.parse(encoded), encoded
+
+    for edit in edits:
+        old_tree.edit(*edit)
+
+    return parser.parse(encoded, old_tree), encoded
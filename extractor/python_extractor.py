@@ -1,19 +1,66 @@
-from tree_sitter_languages import get_parser
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+from tree_sitter import Node
 from .base import DocstringExtractor
+from .parsing import get_shared_parser, kind_ids, parse_cached
 from datamodels import Docstring, Symbol
 
+# Node kind ids checked on every visited node; ints compare faster than type strings
+_DEFINITION_KINDS = kind_ids("python", "function_definition", "class_definition", "module")
+_MODULE_KINDS = kind_ids("python", "module")
+_EXPRESSION_STATEMENT_KINDS = kind_ids("python", "expression_statement")
+_STRING_KINDS = kind_ids("python", "string")
+_COMMENT_KINDS = kind_ids("python", "comment")
+_CALL_KINDS = kind_ids("python", "call")
+
+
+def _node_text(node: Node, byte_code: bytes) -> str:
+    """Return the stripped source text of a node"""
+    return byte_code[node.start_byte:node.end_byte].decode("utf8").strip()
+
+
+def _is_docstring_node(node: Node) -> bool:
+    """Return whether a statement consists of a lone string literal"""
+    return (
+        node.kind_id in _EXPRESSION_STATEMENT_KINDS
+        and node.child_count == 1
+        and node.child(0).kind_id in _STRING_KINDS
+    )
+
+
+def _docstring_of(node: Node, byte_code: bytes) -> Optional[str]:
+    """Return the docstring of a module, class or function node, if it has one"""
+    # A docstring can only be the first statement of the module or of a definition's body
+    body = node if node.kind_id in _MODULE_KINDS else node.child_by_field_name("body")
+    if body is None or not body.named_child_count:
+        return None
+
+    statement = body.named_child(0)
+    while statement is not None and statement.kind_id in _COMMENT_KINDS:
+        statement = statement.next_named_sibling
+
+    if statement is not None and _is_docstring_node(statement):
+        return _node_text(statement.child(0), byte_code)
+    return None
+
+
+def _get_identifier(node: Node, byte_code: bytes) -> str:
+    """Return the name of a class or function node"""
+    name_node = node.child_by_field_name("name")
+    if name_node:
+        return _node_text(name_node, byte_code)
+    return "<unknown>"
+
 
 class PythonDocstringExtractor(DocstringExtractor):
     def __init__(self):
-        self.parser = get_parser("python")
+        self.parser = get_shared_parser("python")
 
     @property
     def suffix(self) -> list[str]:
         return [".py"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts docstrings from a Python source string.
 
@@ -22,48 +69,27 @@ class PythonDocstringExtractor(DocstringExtractor):
         a `Docstring` object with metadata about its symbol.
 
         Args:
-            code (str): The Python source code to analyze.
+            code (str | bytes): The Python source code to analyze, as text or UTF-8 bytes.
 
         Returns:
             List[Docstring]: A list of extracted docstrings.
         """
-        byte_code = code.encode("utf8")
-        tree = self.parser.parse(byte_code)
-        root_node = tree.root_node
+        tree, byte_code = parse_cached(self.parser, code)
         docstrings: List[Docstring] = []
 
-        def is_docstring_node(node):
-            return (
-                node.type == "expression_statement"
-                and node.child_count == 1
-                and node.children[0].type == "string"
-            )
-
-        def extract_from_parent(node):
-            for child in node.children:
-                if child.type == "block":
-                    for block_child in child.children:
-                        if is_docstring_node(block_child):
-                            string_node = block_child.children[0]
-                            return byte_code[string_node.start_byte:string_node.end_byte].decode("utf8").strip()
-                elif is_docstring_node(child):
-                    string_node = child.children[0]
-                    return byte_code[string_node.start_byte:string_node.end_byte].decode("utf8").strip()
-            return None
-
-        def get_identifier(node):
-            name_node = node.child_by_field_name("name")
-            if name_node:
-                return byte_code[name_node.start_byte:name_node.end_byte].decode("utf8").strip()
-            return "<unknown>"
-
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
-
-            if node.type in ["function_definition", "class_definition", "module"]:
-                docstring = extract_from_parent(node)
-                name = "<module>" if node.type == "module" else get_identifier(node)
+        parent_stack: List[str] = []
+        # Whether each node between the root and the cursor pushed a scope name
+        pushed: List[bool] = []
+        cursor = tree.walk()
+
+        while True:
+            node = cursor.node
+            is_scope = False
+
+            if node.kind_id in _DEFINITION_KINDS:
+                is_module = node.kind_id in _MODULE_KINDS
+                docstring = _docstring_of(node, byte_code)
+                name = "<module>" if is_module else _get_identifier(node, byte_code)
 
                 if docstring:
                     docstrings.append(Docstring(
@@ -73,19 +99,23 @@ class PythonDocstringExtractor(DocstringExtractor):
                         docstring=docstring
                     ))
 
-                if node.type != "module":
+                if not is_module:
                     parent_stack.append(name)
+                    is_scope = True
 
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if node.type in ["function_definition", "class_definition"] and parent_stack:
+            # Visit children first, then the next sibling, climbing up once a level is done
+            if cursor.goto_first_child():
+                pushed.append(is_scope)
+                continue
+            if is_scope:
                 parent_stack.pop()
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return docstrings
+                if pushed.pop():
+                    parent_stack.pop()
 
-        traverse(root_node)
-        return docstrings
-
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts symbol usage from a Python source string.
 
@@ -94,32 +124,33 @@ class PythonDocstringExtractor(DocstringExtractor):
         from syntax or casing.
 
         Args:
-            code (str): The Python source code to analyze.
+            code (str | bytes): The Python source code to analyze, as text or UTF-8 bytes.
 
         Returns:
             List[Symbol]: A list of function/class symbols used in the code.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, byte_code = parse_cached(self.parser, code)
         used: List[Symbol] = []
 
-        def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+        # A cursor steps through the tree without building a children list per node
+        cursor = tree.walk()
+        while True:
+            node = cursor.node
+            descend = True
 
-        def walk(node):
-            if node.type == "call":
+            if node.kind_id in _CALL_KINDS:
                 fn_node = node.child_by_field_name("function")
 
                 if fn_node is None:
-                    return
+                    descend = False
 
-                if fn_node.type == "attribute":
+                elif fn_node.type == "attribute":
                     object_node = fn_node.child_by_field_name("object")
                     method_node = fn_node.child_by_field_name("attribute")
 
                     if object_node and method_node:
-                        parent = get_node_text(object_node)
-                        name = get_node_text(method_node)
+                        parent = _node_text(object_node, byte_code)
+                        name = _node_text(method_node, byte_code)
                         used.append(Symbol(
                             name=name,
                             parent=parent,
@@ -127,7 +158,7 @@ class PythonDocstringExtractor(DocstringExtractor):
                         ))
 
                 elif fn_node.type == "identifier":
-                    name = get_node_text(fn_node)
+                    name = _node_text(fn_node, byte_code)
                     symbol_type = "class" if name and name[0].isupper() else "function"
                     used.append(Symbol(
                         name=name,
@@ -135,8 +166,9 @@ class PythonDocstringExtractor(DocstringExtractor):
                         type=symbol_type
                     ))
 
-            for child in node.children:
-                walk(child)
-
-        walk(root)
-        return used
+            # Visit children first, then the next sibling, climbing up once a level is done
+            if descend and cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return used
@@ -1,9 +1,32 @@
-from tree_sitter_languages import get_parser
 from pathlib import Path
 from typing import List, Dict
+from tree_sitter_languages import get_language
 from .base import DocstringExtractor
+from .parsing import get_shared_parser, kind_ids, parse_cached
 from datamodels import Docstring, Symbol
 
+# Node kind ids checked on every visited node; ints compare faster than type strings
+_DECLARATION_KINDS = kind_ids(
+    "typescript",
+    "function_declaration",
+    "method_definition",
+    "class_declaration",
+    "interface_declaration",
+    "type_alias_declaration",
+)
+_SCOPE_KINDS = kind_ids("typescript", "class_declaration", "interface_declaration")
+_PROPERTY_KINDS = kind_ids("typescript", "property_signature", "public_field_definition")
+_VARIABLE_DECLARATION_KINDS = kind_ids("typescript", "variable_declaration")
+_CALL_EXPRESSION_KINDS = kind_ids("typescript", "call_expression")
+_NEW_EXPRESSION_KINDS = kind_ids("typescript", "new_expression")
+_TYPE_ANNOTATION_KINDS = kind_ids("typescript", "type_annotation")
+_COMMENT_KINDS = kind_ids("typescript", "comment")
+_SKIPPABLE_KINDS = kind_ids("typescript", ";", "}", named=False)
+_WRAPPER_KINDS = kind_ids("typescript", "export_statement", "lexical_declaration")
+
+# Leading comment state of a sibling position: no `/**` block and no `//` lines before it
+_NO_COMMENTS = (None, ())
+
 
 class TypeScriptDocstringExtractor(DocstringExtractor):
     """
@@ -11,8 +34,13 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
     Supports class, interface, function, variable, and property-level doc comments.
     """
 
+    # Local names listed in `export { ... }` clauses, matched before the main traversal
+    _export_query = get_language("typescript").query("""
+        (export_clause (export_specifier name: (identifier) @name))
+    """)
+
     def __init__(self):
-        self._parser = get_parser("typescript")
+        self._parser = get_shared_parser("typescript")
 
     @property
     def parser(self):
@@ -22,7 +50,7 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
     def suffix(self) -> list[str]:
         return [".ts", ".tsx"]
 
-    def extract_docstrings(self, code: str) -> List[Docstring]:
+    def extract_docstrings(self, code: str | bytes) -> List[Docstring]:
         """
         Extracts JSDoc-style and `//` docstrings from a TypeScript code snippet.
 
@@ -31,81 +59,69 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
         structured `Docstring` objects.
 
         Args:
-            code (str): The TypeScript source code.
+            code (str | bytes): The TypeScript source code, as text or UTF-8 bytes.
 
         Returns:
             List[Docstring]: A list of structured docstring objects extracted from the code.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root_node = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         docstrings: List[Docstring] = []
-        exported_identifiers = set()
 
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
-
-        def extract_leading_doc_comment(node):
-            def find_leading_comment_among_siblings(target_node):
-                if not hasattr(target_node, "parent") or target_node.parent is None:
-                    return None
-
-                siblings = target_node.parent.children
-                idx = siblings.index(target_node)
-                collected = []
-
-                for i in reversed(range(0, idx)):
-                    prev = siblings[i]
-                    text = get_node_text(prev)
-
-                    if prev.type == "comment":
-                        if text.startswith("/**"):
-                            return text
-                        elif text.startswith("//"):
-                            collected.insert(0, text)
-                        else:
-                            break
-                    elif prev.type in [";", "}"]:
-                        continue
-                    else:
-                        break
-
-                if collected:
-                    return "\n".join(collected)
-                return None
-
-            comment = find_leading_comment_among_siblings(node)
-            if comment:
-                return comment
-
-            parent = node.parent
-            while parent is not None and parent.type in ["export_statement", "lexical_declaration"]:
-                comment = find_leading_comment_among_siblings(parent)
-                if comment:
-                    return comment
-                parent = parent.parent
-
-            return None
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
+
+        # Collected up front: `export { name }` may come after the declaration it exports
+        exported_identifiers = {
+            get_node_text(node)
+            for node, _ in self._export_query.captures(tree.root_node)
+        }
+
+        def after_sibling(state, node):
+            # The comments the following siblings of `node` may take as their leading comment:
+            # the byte span of the latest `/**` block, and those of the `//` lines seen since it.
+            # Comments are classified on the raw bytes and only decoded once one is used.
+            kind = node.kind_id
+            if kind in _SKIPPABLE_KINDS:
+                return state
+            if kind in _COMMENT_KINDS:
+                start = node.start_byte
+                if code_bytes.startswith(b"/**", start):
+                    return (start, node.end_byte), ()
+                if code_bytes.startswith(b"//", start):
+                    block, lines = state
+                    if lines:
+                        lines.append((start, node.end_byte))
+                        return state
+                    return block, [(start, node.end_byte)]
+            return _NO_COMMENTS
+
+        def span_text(span):
+            start, end = span
+            return code_bytes[start:end].decode("utf8").strip()
+
+        def leading_comment(state):
+            block, lines = state
+            if block is not None:
+                return span_text(block)
+            return "\n".join(map(span_text, lines)) if lines else None
 
         def get_node_name(node):
-            if node.type in ["identifier", "type_identifier", "property_identifier"]:
-                return get_node_text(node)
+            name_node = node.child_by_field_name("name")
+            if name_node:
+                return get_node_text(name_node)
+
+            # No name field: look one level down instead of searching the whole subtree
             for child in node.children:
-                name = get_node_name(child)
-                if name != "<anonymous>":
-                    return name
+                if child.type in ["identifier", "type_identifier", "property_identifier"]:
+                    return get_node_text(child)
             return "<anonymous>"
 
-        def collect_exported_identifiers(node):
-            if node.type == "export_statement":
-                for child in node.children:
-                    if child.type == "export_clause":
-                        for ident in child.children:
-                            if ident.type == "identifier":
-                                exported_identifiers.add(get_node_text(ident))
-
         def extract_variable_function_doc(node, parent_stack):
             results = []
+            state = _NO_COMMENTS
             for declarator in node.children:
+                comment = leading_comment(state)
+                state = after_sibling(state, declarator)
                 if declarator.type != "variable_declarator":
                     continue
 
@@ -116,7 +132,7 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                     identifier_name = get_node_text(identifier_node)
                     if identifier_name not in exported_identifiers:
                         continue
-                    doc = extract_leading_doc_comment(declarator)
+                    doc = comment
                     if doc:
                         results.append(Docstring(
                             name=identifier_name,
@@ -126,20 +142,31 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                         ))
             return results
 
-        def traverse(node, parent_stack=None):
-            if parent_stack is None:
-                parent_stack = []
-
-            is_parent_scope = node.type in ["class_declaration", "interface_declaration"]
-
-            if node.type in [
-                "function_declaration",
-                "method_definition",
-                "class_declaration",
-                "interface_declaration",
-                "type_alias_declaration",
-            ]:
-                doc = extract_leading_doc_comment(node)
+        parent_stack: List[str] = []
+        # Whether each node between the root and the cursor pushed a scope name
+        pushed: List[bool] = []
+        # Per depth, the comment state left by the siblings the cursor has passed at that depth
+        sibling_comments: List[tuple] = [_NO_COMMENTS]
+        # Per ancestor, the comment leading it when it is an export or lexical wrapper (which
+        # a declaration without its own comment inherits), or False for any other ancestor
+        wrapper_comments: list = []
+        cursor = tree.walk()
+
+        def extract_leading_doc_comment():
+            comment = leading_comment(sibling_comments[-1])
+            depth = len(wrapper_comments)
+            while not comment and depth and wrapper_comments[depth - 1] is not False:
+                depth -= 1
+                comment = wrapper_comments[depth]
+            return comment
+
+        while True:
+            node = cursor.node
+            kind = node.kind_id
+            is_scope = False
+
+            if kind in _DECLARATION_KINDS:
+                doc = extract_leading_doc_comment()
                 name = get_node_name(node)
                 if doc:
                     docstrings.append(Docstring(
@@ -148,11 +175,12 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                         parent=parent_stack[-1] if parent_stack else None,
                         docstring=doc
                     ))
-                if is_parent_scope:
+                if kind in _SCOPE_KINDS:
                     parent_stack.append(name)
+                    is_scope = True
 
-            elif node.type in ["property_signature", "public_field_definition"]:
-                doc = extract_leading_doc_comment(node)
+            elif kind in _PROPERTY_KINDS:
+                doc = extract_leading_doc_comment()
                 name = get_node_name(node)
                 if doc:
                     docstrings.append(Docstring(
@@ -162,26 +190,32 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                         docstring=doc
                     ))
 
-            elif node.type == "variable_declaration":
+            elif kind in _VARIABLE_DECLARATION_KINDS:
                 docstrings.extend(extract_variable_function_doc(node, parent_stack))
 
-            elif node.type == "export_statement":
-                collect_exported_identifiers(node)
-                for child in node.children:
-                    traverse(child, parent_stack)
-                return
-
-            for child in node.children:
-                traverse(child, parent_stack)
-
-            if is_parent_scope and parent_stack:
+            # Leading comments are tracked as the cursor passes them, not looked up backwards
+            state = sibling_comments[-1]
+            if kind in _COMMENT_KINDS or state is not _NO_COMMENTS:
+                sibling_comments[-1] = after_sibling(state, node)
+
+            # Visit children first, then the next sibling, climbing up once a level is done
+            if cursor.goto_first_child():
+                pushed.append(is_scope)
+                wrapper_comments.append(leading_comment(state) if kind in _WRAPPER_KINDS else False)
+                sibling_comments.append(_NO_COMMENTS)
+                continue
+            if is_scope:
                 parent_stack.pop()
-
-        traverse(root_node)
-        return docstrings
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return docstrings
+                sibling_comments.pop()
+                wrapper_comments.pop()
+                if pushed.pop():
+                    parent_stack.pop()
 
 
-    def extract_used_symbols(self, code: str) -> List[Symbol]:
+    def extract_used_symbols(self, code: str | bytes) -> List[Symbol]:
         """
         Extracts used symbols (functions, methods, classes) from a TypeScript code snippet.
 
@@ -189,27 +223,31 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
         constructor calls, and method invocations, and returns them as `Symbol` objects.
 
         Args:
-            code (str): The TypeScript source code.
+            code (str | bytes): The TypeScript source code, as text or UTF-8 bytes.
 
         Returns:
             List[Symbol]: A list of used symbols with name, parent, and type.
         """
-        tree = self.parser.parse(code.encode("utf8"))
-        root = tree.root_node
+        tree, code_bytes = parse_cached(self.parser, code)
         used: List[Symbol] = []
 
         def get_node_text(node):
-            return code.encode("utf8")[node.start_byte:node.end_byte].decode("utf8").strip()
+            return code_bytes[node.start_byte:node.end_byte].decode("utf8").strip()
+
+        # A cursor steps through the tree without building a children list per node
+        cursor = tree.walk()
+        while True:
+            node = cursor.node
+            descend = True
 
-        def walk(node):
             # function or method call: foo(), obj.method()
-            if node.type == "call_expression":
+            if node.kind_id in _CALL_EXPRESSION_KINDS:
                 fn_node = node.child_by_field_name("function")
 
                 if fn_node is None:
-                    return
+                    descend = False
 
-                if fn_node.type == "member_expression":
+                elif fn_node.type == "member_expression":
                     object_node = fn_node.child_by_field_name("object")
                     property_node = fn_node.child_by_field_name("property")
 
@@ -233,7 +271,7 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                     ))
 
             # constructor usage: new Foo()
-            elif node.type == "new_expression":
+            elif node.kind_id in _NEW_EXPRESSION_KINDS:
                 constructor_node = node.child_by_field_name("constructor")
                 if constructor_node and constructor_node.type == "identifier":
                     name = get_node_text(constructor_node)
@@ -244,14 +282,15 @@ class TypeScriptDocstringExtractor(DocstringExtractor):
                     ))
 
             # interface usage: const x: SomeType
-            elif node.type == "type_annotation":
+            elif node.kind_id in _TYPE_ANNOTATION_KINDS:
                 for child in node.children:
                     if child.type == "type_identifier":
                         name = get_node_text(child)
                         used.append(Symbol(name=name, parent=None, type="interface"))
 
-            for child in node.children:
-                walk(child)
-
-        walk(root)
-        return used
\ No newline at end of file
+            # Visit children first, then the next sibling, climbing up once a level is done
+            if descend and cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return used
\ No newline at end of file
@@ -1,21 +1,317 @@
+import hashlib
 import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Union
-from extractor.base import DocstringExtractor
+from typing import AbstractSet, Callable, Deque, Iterable, Iterator, List, Dict, Optional, Tuple, TypeVar, Union
+from extractor.base import MIN_PARALLEL_BATCH, DocstringExtractor, _extract_one
+from doc_cache import DEFAULT_CACHE_PATH, DocCache
 from logger import logger 
-from datamodels import Docstring, Symbol
+from datamodels import Docstring, Symbol, to_dict
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is the fallback
+    orjson = None
+
+T = TypeVar("T")
+
+# Files above this size are almost always generated or vendored, and dominate parse time
+MAX_FILE_BYTES = 2 * 1024 * 1024
+# A file this large without a newline in its first block is treated as minified
+MINIFIED_MIN_BYTES = 200_000
+MINIFIED_PROBE_BYTES = 64 * 1024
+# How many files may be read ahead of the parser, and by how many threads
+READ_AHEAD_FILES = 32
+READ_THREADS = 8
+# Files are sent to worker processes in batches of this many, with at most this many batches
+# per worker waiting, so only a bounded amount of source is held in memory at once
+EXTRACT_BATCH_FILES = 16
+EXTRACT_BATCHES_PER_WORKER = 2
+# Directories that never hold project sources worth documenting; they are not descended into
+IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "__pycache__", ".venv", "venv", ".tox",
+    "dist", "build", ".mypy_cache", ".pytest_cache",
+})
+
+
+@lru_cache(maxsize=8)
+def _build_suffix_map(extractors: Tuple[DocstringExtractor, ...]) -> Dict[str, DocstringExtractor]:
+    """
+    Maps each file suffix to the extractor that handles it, the last extractor listing it winning.
+
+    Memoized on the extractor instances, so repeated collections with the same extractors (for
+    example one per subdirectory) share one map. Callers must not modify the returned dict.
+    """
+    return {
+        suffix: extractor
+        for extractor in extractors
+        for suffix in extractor.suffix
+    }
+
+
+def _walk_files(
+    root_dir: str,
+    suffixes: Iterable[str],
+    ignore_dirs: AbstractSet[str] = IGNORED_DIRS
+) -> Iterator[Tuple[str, str, int]]:
+    """
+    Yields the path, suffix and inode number of every file under a directory with one of the
+    given suffixes, skipping directories named in `ignore_dirs`.
+
+    Uses `os.scandir` directly, so no `Path` is built for entries that are filtered out and
+    directory checks come from the directory listing instead of extra `stat` calls. The suffix
+    is checked on the entry name before the file check and handed back with the path, so callers
+    never parse it again. Inode numbers come from the directory listing as well, so callers can
+    order reads by position on disk without a `stat` per file. Files are yielded in the same
+    order as `Path.rglob("*")`: a directory's own entries before those of its subdirectories.
+    Symlinked directories are not followed and unreadable ones are skipped.
+
+    Args:
+        root_dir (str): The directory to walk.
+        suffixes (Iterable[str]): File suffixes to match, as returned by `Path.suffix`.
+        ignore_dirs (AbstractSet[str]): Names of directories not to descend into.
+
+    Yields:
+        Tuple[str, str, int]: The path, suffix and inode number of each matching file.
+    """
+    suffixes = frozenset(suffixes)
+    stack = [root_dir]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in ignore_dirs:
+                            subdirs.append(entry.path)
+                    else:
+                        suffix = os.path.splitext(entry.name)[1]
+                        if suffix in suffixes and entry.is_file():
+                            yield entry.path, suffix, entry.inode()
+        except OSError as e:
+            logger.debug("Skipping unreadable directory: %s", e)
+        stack.extend(reversed(subdirs))
+
+
+def _skip_reason(size: int, max_file_bytes: int) -> Optional[str]:
+    """Return why a file of this size is not worth reading, or None if it should be read"""
+    if size == 0:
+        return "empty"
+    if size > max_file_bytes:
+        return f"larger than {max_file_bytes} bytes"
+    return None
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Read a whole file from a descriptor, given the size reported by `fstat`"""
+    data = os.read(fd, size + 1)
+    if len(data) == size:
+        return data
+
+    # Short read, or the file changed since it was stat'ed: read on until end of file
+    chunks = [data]
+    while chunk := os.read(fd, 64 * 1024):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _normalize_newlines(code: bytes) -> bytes:
+    """Translate CRLF and lone CR line endings to LF, as reading in text mode does"""
+    if b"\r" in code:
+        code = code.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return code
+
+
+def _read_source(path: Union[str, Path], max_file_bytes: int) -> Optional[bytes]:
+    """
+    Read a source file's raw bytes, or return None if it is not worth parsing.
+
+    Goes through `os.open`/`os.fstat`/`os.read` rather than a buffered file object, so each file
+    costs one open, one stat and a single read sized from that stat. Files large enough to be
+    minified are probed first: only their first block is read until it shows a line break.
+    Line endings are normalized to LF, so docstrings come out the same whatever convention a
+    file uses. Files that are not valid UTF-8 raise `UnicodeDecodeError`, as reading them as
+    text would, rather than reaching the parser.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        reason = _skip_reason(size, max_file_bytes)
+        if reason is None:
+            head = b""
+            if size > MINIFIED_MIN_BYTES:
+                head = os.read(fd, MINIFIED_PROBE_BYTES)
+                if b"\n" not in head:
+                    reason = "minified"
+            if reason is None:
+                code = head + _read_fd(fd, size - len(head))
+                code.decode("utf8")
+                return _normalize_newlines(code)
+    finally:
+        os.close(fd)
+
+    logger.debug("Skipping %s: %s", path, reason)
+    return None
+
+
+def _read_ahead(
+    file_paths: Iterable[str],
+    max_file_bytes: int
+) -> Iterator[Tuple[str, Optional[bytes], Optional[Union[OSError, UnicodeDecodeError]]]]:
+    """
+    Reads source files on a pool of threads ahead of the caller, yielding them in order.
+
+    File reads release the GIL, so they overlap with each other and with whatever the caller
+    does with the files already yielded. A sliding window of `READ_AHEAD_FILES` reads is kept
+    in flight; `file_paths` is consumed lazily on the caller's thread as the window advances.
+
+    Args:
+        file_paths (Iterable[str]): The files to read, in the order they should be yielded.
+        max_file_bytes (int): Files larger than this are skipped.
+
+    Yields:
+        Tuple[str, bytes | None, OSError | UnicodeDecodeError | None]: Each file with its source
+        (None when skipped) or the error raised while reading or decoding it.
+    """
+    def result(file_path: str, read: Future):
+        try:
+            return file_path, read.result(), None
+        except (OSError, UnicodeDecodeError) as e:
+            return file_path, None, e
+
+    with ThreadPoolExecutor(max_workers=READ_THREADS, thread_name_prefix="doc-extractor-reader") as pool:
+        window: Deque[Tuple[str, Future]] = deque()
+        for file_path in file_paths:
+            window.append((file_path, pool.submit(_read_source, file_path, max_file_bytes)))
+            if len(window) >= READ_AHEAD_FILES:
+                yield result(*window.popleft())
+        while window:
+            yield result(*window.popleft())
+
+
+def _try_extract(
+    extract: Callable[[bytes], List[Docstring]],
+    code: bytes
+) -> Tuple[Optional[List[Docstring]], Optional[str]]:
+    """Run one extraction, returning the error message instead of raising it"""
+    try:
+        return extract(code), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _extract_batch(
+    jobs: List[Tuple[DocstringExtractor, bytes]]
+) -> List[Tuple[Optional[List[Docstring]], Optional[str]]]:
+    """Extract a batch of files inside a worker process"""
+    return [_try_extract(partial(_extract_one, extractor), code) for extractor, code in jobs]
+
+
+@contextmanager
+def _worker_pool(file_count: int, parallel: bool = True) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """
+    Starts worker processes for extracting `file_count` files, or yields None when they should
+    be extracted in this process.
+
+    The workers are started before anything else runs, so none of them is forked while the
+    read-ahead's threads are alive.
+    """
+    if not parallel or file_count < MIN_PARALLEL_BATCH:
+        yield None
+        return
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        # The first task starts the workers (all of them at once when they are forked)
+        executor.submit(os.getpid).result()
+        yield executor
+
+
+def _extract_stream(
+    jobs: Iterable[Tuple[T, DocstringExtractor, bytes]],
+    executor: Optional[ProcessPoolExecutor] = None
+) -> Iterator[Tuple[T, Tuple[Optional[List[Docstring]], Optional[str]]]]:
+    """
+    Extracts docstrings from files as they arrive, yielding results in the order of `jobs`.
+
+    Each result is a `(docstrings, error)` pair, so one file that fails to parse does not abort
+    the rest. Without an executor each file is extracted in this process. With one, files are
+    sent to the workers in batches of `EXTRACT_BATCH_FILES` and `jobs` is only consumed while
+    fewer than `EXTRACT_BATCHES_PER_WORKER` batches per worker are waiting, so the sources held
+    in memory stay bounded however many files there are. Workers receive pickled copies of
+    the extractors, so their configuration and instance state carry over.
+
+    Args:
+        jobs (Iterable[Tuple[T, DocstringExtractor, bytes]]): A tag, the extractor and the
+            source bytes of each file.
+        executor (ProcessPoolExecutor | None): The workers to extract on, from `_worker_pool`.
+
+    Yields:
+        Tuple[T, Tuple[List[Docstring] | None, str | None]]: Each file's tag with its docstrings
+        or error.
+    """
+    if executor is None:
+        for tag, extractor, code in jobs:
+            yield tag, _try_extract(extractor.extract_docstrings, code)
+        return
+
+    max_waiting = EXTRACT_BATCHES_PER_WORKER * (os.cpu_count() or 1)
+    window: Deque[Tuple[List[T], Future]] = deque()
+
+    def submit(batch: List[Tuple[T, DocstringExtractor, bytes]]):
+        window.append((
+            [tag for tag, _, _ in batch],
+            executor.submit(_extract_batch, [(extractor, code) for _, extractor, code in batch])
+        ))
+
+    def finish_oldest():
+        tags, extracted = window.popleft()
+        return zip(tags, extracted.result())
+
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= EXTRACT_BATCH_FILES:
+            submit(batch)
+            batch = []
+            if len(window) >= max_waiting:
+                yield from finish_oldest()
+    if batch:
+        submit(batch)
+    while window:
+        yield from finish_oldest()
 
 
 def collect_all_docstrings_in_project(
     root_dir: Union[str, Path],
-    extractors: List[DocstringExtractor]
+    extractors: List[DocstringExtractor],
+    cache_path: Union[str, Path, None] = DEFAULT_CACHE_PATH,
+    max_file_bytes: int = MAX_FILE_BYTES,
+    parallel: bool = True,
+    ignore_dirs: AbstractSet[str] = IGNORED_DIRS
 ) -> List[Docstring]:
     """
     Walks through a project directory and extracts docstrings using all supported language extractors.
 
+    Docstrings are cached per file in a SQLite database, so later runs only parse the files
+    whose content changed, and do not even read files whose modification time and size are
+    unchanged. The other files are read on a pool of threads, in inode order so that reads from
+    a cold disk are mostly sequential, and when many files need parsing they are spread across
+    processes. Empty and oversized files are skipped without being read, minified ones after
+    reading only their first block, and directories named in `ignore_dirs` are not walked.
+
     Args:
         root_dir (str | Path): Root directory of the codebase.
         extractors (List[DocstringExtractor]): A list of extractors for different languages.
+        cache_path (str | Path | None): Where to keep the docstring cache. Pass None to disable it.
+        max_file_bytes (int): Files larger than this are skipped.
+        parallel (bool): Whether to spread parsing across processes. Disable to parse in-process.
+        ignore_dirs (AbstractSet[str]): Names of directories not to descend into. Defaults to
+            `IGNORED_DIRS`; pass an empty set to walk every directory.
 
     Returns:
         List[Docstring]: Extracted docstrings with optional file information.
@@ -23,39 +319,117 @@ def collect_all_docstrings_in_project(
     root_dir = Path(root_dir)
     all_docs: List[Docstring] = []
 
-    suffix_to_extractor = {
-        suffix: extractor
-        for extractor in extractors
-        for suffix in extractor.suffix
-    }
+    suffix_to_extractor = _build_suffix_map(tuple(extractors))
 
-    for file_path in root_dir.rglob("*"):
-        extractor = suffix_to_extractor.get(file_path.suffix)
-        if extractor:
-            try:
-                code = file_path.read_text(encoding="utf8")
-                docstring_objs = extractor.extract_docstrings(code)
+    with DocCache(cache_path) if cache_path is not None else nullcontext() as cache:
+        # One slot per file in walk order, filled in as the files are answered or extracted
+        results: List[Optional[List[Docstring]]] = []
+        # Result slot, extractor and stat of each file handed to the read-ahead
+        to_read: Dict[str, Tuple[int, DocstringExtractor, Optional[os.stat_result]]] = {}
+
+        # Inode and path of each file handed to the read-ahead
+        unread: List[Tuple[int, str]] = []
+        walked = set()
+
+        for path, suffix, inode in _walk_files(str(root_dir), suffix_to_extractor, ignore_dirs):
+            extractor = suffix_to_extractor[suffix]
+            walked.add(path)
+
+            stat = None
+            if cache:
+                # Untouched files are answered without being read or hashed
+                try:
+                    stat = os.stat(path)
+                except OSError as e:
+                    logger.warning("Failed to read %s: %s", path, e)
+                    continue
+                docstring_objs = cache.get_unchanged(
+                    path, type(extractor).__name__, stat.st_mtime_ns, stat.st_size
+                )
+                if docstring_objs is not None:
+                    results.append(docstring_objs)
+                    continue
+
+            to_read[path] = (len(results), extractor, stat)
+            results.append(None)
+            unread.append((inode, path))
+
+        if cache:
+            # Entries of files deleted since the last run would otherwise stay forever
+            cache.purge_missing(str(root_dir), walked)
+
+        # Reading in inode order keeps disk access mostly sequential when the page cache is cold;
+        # every result still goes to its file's slot, so the output stays in walk order
+        unread.sort()
+
+        def cache_misses():
+            # Runs on this thread as the extraction pulls files, so the cache is never shared
+            for path, code, error in _read_ahead([path for _, path in unread], max_file_bytes):
+                index, extractor, stat = to_read.pop(path)
+                if error is not None:
+                    logger.warning("Failed to read %s: %s", path, error)
+                    continue
+                if code is None:
+                    continue
+
+                extractor_name = type(extractor).__name__
+                digest = None
+                if cache:
+                    digest = hashlib.sha256(code).digest()
+                    docstring_objs = cache.get(path, extractor_name, digest)
+                    if docstring_objs is not None:
+                        # Same content with a new timestamp; record it so the next run skips the read
+                        cache.put(path, extractor_name, digest, docstring_objs, stat.st_mtime_ns, stat.st_size)
+                        results[index] = docstring_objs
+                        continue
+
+                yield (index, path, extractor_name, digest, stat), extractor, code
+
+        with _worker_pool(len(unread), parallel) as executor:
+            extracted = _extract_stream(cache_misses(), executor)
+            for (index, path, extractor_name, digest, stat), (docstring_objs, error) in extracted:
+                if error is not None:
+                    logger.warning("Failed to parse %s: %s", path, error)
+                    continue
 
                 for doc in docstring_objs:
-                    doc.file = str(file_path)  # Inject file path here
-                    all_docs.append(doc)
-            except Exception as e:
-                logger.warning(f"Failed to parse {file_path}: {e}")
+                    doc.file = path  # Inject file path here
+                if cache:
+                    cache.put(path, extractor_name, digest, docstring_objs, stat.st_mtime_ns, stat.st_size)
+                results[index] = docstring_objs
+
+    for docstring_objs in results:
+        if docstring_objs:
+            all_docs.extend(docstring_objs)
 
-    logger.info(f"Collected {len(all_docs)} docstrings from {root_dir}")
+    logger.info("Collected %d docstrings from %s", len(all_docs), root_dir)
     return all_docs
 
 
 def collect_docstrings_in_project(
     root_dir: Union[str, Path],
-    extractor: "DocstringExtractor"
+    extractor: "DocstringExtractor",
+    max_file_bytes: int = MAX_FILE_BYTES,
+    parallel: bool = True,
+    ignore_dirs: AbstractSet[str] = IGNORED_DIRS
 ) -> List[Docstring]:
     """
     Walks through a project directory and extracts docstrings using the provided extractor.
 
+    Files are read on a pool of threads, in inode order so that reads from a cold disk are mostly
+    sequential; docstrings are still returned in walk order. Each file is parsed while the next
+    ones are being read, spread across processes in bounded batches when there are many files
+    and parsing in parallel. Empty and oversized files are skipped without being read,
+    minified ones after reading only their first block, and directories named in `ignore_dirs`
+    are not walked.
+
     Args:
         root_dir (str | Path): Root directory of the codebase.
         extractor (DocstringExtractor): An instance of a concrete extractor.
+        max_file_bytes (int): Files larger than this are skipped.
+        parallel (bool): Whether to spread parsing across processes. Disable to parse in-process.
+        ignore_dirs (AbstractSet[str]): Names of directories not to descend into. Defaults to
+            `IGNORED_DIRS`; pass an empty set to walk every directory.
 
     Returns:
         List[Docstring]: Extracted docstrings with optional file information.
@@ -63,22 +437,67 @@ def collect_docstrings_in_project(
     root_dir = Path(root_dir)
     all_docs: List[Docstring] = []
 
-    for file_path in root_dir.rglob("*"):
-        if file_path.suffix in extractor.suffix:
-            try:
-                code = file_path.read_text(encoding="utf8")
-                docstring_objs = extractor.extract_docstrings(code)
+    # Inode, walk position and path of each file, sorted to read them in inode order
+    walked = _walk_files(str(root_dir), extractor.suffix, ignore_dirs)
+    files = sorted((inode, index, path) for index, (path, _, inode) in enumerate(walked))
+    # One slot per file in walk order
+    results: List[Optional[List[Docstring]]] = [None] * len(files)
 
-                for doc in docstring_objs:
-                    doc.file = str(file_path)
-                    all_docs.append(doc)
-            except Exception as e:
-                logger.warning(f"Failed to parse {file_path}: {e}")
+    def readable_files():
+        read = _read_ahead([path for _, _, path in files], max_file_bytes)
+        # strict=True drains the read-ahead, so its reader threads are shut down with it
+        for (_, index, _), (file_path, code, error) in zip(files, read, strict=True):
+            if error is not None:
+                logger.warning("Failed to read %s: %s", file_path, error)
+                continue
+            if code is not None:
+                yield (index, file_path), extractor, code
+
+    with _worker_pool(len(files), parallel) as executor:
+        for (index, file_path), (docstring_objs, error) in _extract_stream(readable_files(), executor):
+            if error is not None:
+                logger.warning("Failed to parse %s: %s", file_path, error)
+                continue
+
+            for doc in docstring_objs:
+                doc.file = file_path
+            results[index] = docstring_objs
 
-    logger.info(f"Collected {len(all_docs)} docstrings from {root_dir}")
+    for docstring_objs in results:
+        if docstring_objs:
+            all_docs.extend(docstring_objs)
+
+    logger.info("Collected %d docstrings from %s", len(all_docs), root_dir)
     return all_docs
 
 
+def _write_bytes(path: Union[str, Path], data: bytes):
+    """
+    Replace a file's content with `data`.
+
+    Goes through `os.open`/`os.write` rather than a buffered file object, so the encoded output
+    is handed to the OS as is, in a single write unless the OS accepts only part of it.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_json(items: Union[List[Docstring], List[Symbol]], output_path: Path):
+    """Write dataclass instances as indented JSON, encoding with orjson when it is installed"""
+    if orjson is not None:
+        # orjson encodes dataclasses itself, so no intermediate dict is built per item
+        _write_bytes(output_path, orjson.dumps(items, option=orjson.OPT_INDENT_2))
+    else:
+        # Stream the encoder's chunks to the file instead of building one large string first
+        with output_path.open("w", encoding="utf8") as f:
+            json.dump([to_dict(item) for item in items], f, indent=2)
+
+
 def save_docstrings_to_json(
     docstrings: List[Docstring],
     output_path: Union[str, Path]
@@ -93,10 +512,9 @@ def save_docstrings_to_json(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    json_data = [doc.model_dump() for doc in docstrings]
-    output_path.write_text(json.dumps(json_data, indent=2), encoding="utf8")
+    _write_json(docstrings, output_path)
 
-    logger.info(f"Saved {len(docstrings)} docstrings to {output_path}")
+    logger.info("Saved %d docstrings to %s", len(docstrings), output_path)
 
 
 def save_symbols_to_json(
@@ -113,7 +531,6 @@ def save_symbols_to_json(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)  # Create parent directories if needed
 
-    json_data = [symbol.model_dump() for symbol in symbols]
-    output_path.write_text(json.dumps(json_data, indent=2), encoding="utf8")
+    _write_json(symbols, output_path)
     
-    logger.info(f"Saved {len(symbols)} symbols to {output_path}")
\ No newline at end of file
+    logger.info("Saved %d symbols to %s", len(symbols), output_path)
\ No newline at end of file
@@ -2,11 +2,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 logger.setLevel("INFO")
+# Messages are printed by the handler below only, not again by handlers on the root logger
+logger.propagate = False
 
-# Console handler with formatter
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-formatter = logging.Formatter("[%(levelname)s] %(message)s")
-ch.setFormatter(formatter)
+# Console handler with formatter; only added once even if this module is executed again
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter("[%(levelname)s] %(message)s")
+    ch.setFormatter(formatter)
 
-logger.addHandler(ch)
\ No newline at end of file
+    logger.addHandler(ch)